@@ -5,12 +5,45 @@ This module handles all interactions with the Anthropic Claude API.
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Error: requests module not installed. Please install it using 'pip install requests'")
     # Provide a fallback implementation if possible, or exit gracefully
     
+# Optional async HTTP client for concurrent verification
+try:
+    import httpx
+    HTTPX_SUPPORT = True
+except ImportError:
+    HTTPX_SUPPORT = False
+
+# HTTP/2 support for httpx (installed with httpx[http2])
+try:
+    import h2
+    HTTP2_SUPPORT = True
+except ImportError:
+    HTTP2_SUPPORT = False
+
+# Optional faster JSON parser for API responses
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+import asyncio
+import functools
+import hashlib
 import json
-import base64
+import re
+import threading
+# SIMD accelerated base64 (pybase64) is a drop-in replacement when installed
+try:
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
+from collections import OrderedDict
 from PIL import Image
 import io
 import os
@@ -19,9 +52,65 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-def get_system_prompt():
-    """Return the system prompt for invoice verification."""
-    return """**הגדרת תפקיד / אישיות:**
+API_URL = "https://api.anthropic.com/v1/messages"
+ANTHROPIC_VERSION = "2023-06-01"
+
+# Headers shared by every request; only x-api-key is added per call
+_STATIC_HEADERS = {
+    "anthropic-version": ANTHROPIC_VERSION,
+    "content-type": "application/json"
+}
+
+# (connect, read) timeouts in seconds: fail fast when the network is down,
+# but give Claude enough time to analyze the images
+REQUEST_TIMEOUT = (3.05, 60)
+
+# Mapping from the Hebrew status returned by Claude to the internal status code
+STATUS_CODES = {
+    "תקין": "valid",
+    "לא תקין": "invalid",
+    "לא ברור": "unclear"
+}
+
+# Longest side images are downscaled to before sending, matching Claude's vision resolution
+MAX_IMAGE_DIM = 1568
+
+# Largest original file sent without re-encoding; its base64 (x4/3) stays under the API's 5 MB image limit
+MAX_RAW_IMAGE_BYTES = 3_750_000
+
+# Encoded invoices kept in memory (least recently used are dropped first)
+INVOICE_CACHE_SIZE = 32
+_INVOICE_CACHE = OrderedDict()
+_INVOICE_CACHE_LOCK = threading.Lock()  # Invoices are encoded from worker threads
+
+# Matches the summary line Claude is asked to end its answer with
+_STATUS_RE = re.compile(r"STATUS:\s*(תקין|לא תקין|לא ברור)")
+_STATUS_TAIL_CHARS = 32  # Comfortably longer than a STATUS line with normal spacing
+
+# Batch verification: invoices per request and output tokens reserved for each
+DEFAULT_BATCH_SIZE = 4
+BATCH_TOKENS_PER_INVOICE = 300
+
+# Retry transient failures (rate limiting, overloaded servers) with exponential backoff.
+# POST is not retried by urllib3 by default, so it is allowed explicitly. Read errors
+# (e.g. timeouts) are not retried, since the API may already have processed the request.
+_RETRY = Retry(
+    total=4,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504, 529],  # 529: API overloaded
+    allowed_methods={"POST"},
+    respect_retry_after_header=True
+)
+
+# Shared HTTP session so that consecutive verifications reuse the same
+# keep-alive TCP/TLS connection to the API instead of reconnecting each time
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=_RETRY))
+_SESSION.headers.update(_STATIC_HEADERS)
+
+# System prompt for invoice verification, built once at import
+_SYSTEM_PROMPT = """**הגדרת תפקיד / אישיות:**
 אתה מבקר פנימי בארגון, האחראי לוודא שכל החשבוניות המוגשות עומדות בסטנדרטים של חוקיות, ניהול תקין, טוהר המידות, חיסכון ויעילות. תפקידך כולל בדיקת התאמת החתימות על החשבוניות למורשי החתימה המאושרים, בהתאם לסכומים המצוינים. מטרתך היא להבטיח שכל התהליכים הכספיים בארגון מתבצעים בהתאם למדיניות ולנהלים הפנימיים.
 **רקע / הקשר:**
 בארגון קיימת מדיניות ברורה לגבי אישור חשבוניות:
@@ -40,53 +129,170 @@ def get_system_prompt():
 * חשוב לציין בדיוק איפה בתמונה נמצאת החתימה ולתאר אותה בקצרה.
 * יש לציין בפירוש "סטטוס: תקין" או "סטטוס: לא תקין" או "סטטוס: לא ברור" כדי שהמערכת תוכל לזהות את הסטטוס באופן אוטומטי."""
 
-    # return """**הגדרת תפקיד:** 
-    #     אתה מבקר פנימי בארגון, האחראי לוודא שחשבוניות עומדות בסטנדרטים של ניהול תקין ותואמות את הרשאות החתימה.
+# _SYSTEM_PROMPT = """**הגדרת תפקיד:** 
+#     אתה מבקר פנימי בארגון, האחראי לוודא שחשבוניות עומדות בסטנדרטים של ניהול תקין ותואמות את הרשאות החתימה.
 
-    #     **רקע:** 
-    #     לכל מורשה חתימה יש סכום מקסימלי לאישור. עליך לבדוק את התאמת החתימה לסכום החשבונית.
+#     **רקע:** 
+#     לכל מורשה חתימה יש סכום מקסימלי לאישור. עליך לבדוק את התאמת החתימה לסכום החשבונית.
 
-    #     **פורמט דיווח:**
-    #     הצג תשובה קצרה ומדויקת הכוללת אך ורק:
-    #     * 1. סכום החשבונית: [הסכום בש"ח]
-    #     * 2. מורשה חתימה: [שם מלא של מורשה החתימה שזוהה]
-    #     * 3. סטטוס: [תקין/לא תקין/לא ברור] - [סיבה קצרה במקרה הצורך]
+#     **פורמט דיווח:**
+#     הצג תשובה קצרה ומדויקת הכוללת אך ורק:
+#     * 1. סכום החשבונית: [הסכום בש"ח]
+#     * 2. מורשה חתימה: [שם מלא של מורשה החתימה שזוהה]
+#     * 3. סטטוס: [תקין/לא תקין/לא ברור] - [סיבה קצרה במקרה הצורך]
 
-    #     אין לחזור על המידע או להוסיף הסברים מעבר למבוקש."""
+#     אין לחזור על המידע או להוסיף הסברים מעבר למבוקש."""
 
-def encode_image(image):
+def get_system_prompt():
+    """Return the system prompt for invoice verification."""
+    return _SYSTEM_PROMPT
+
+def encode_image(image, raw_bytes=None, source_format=None, max_dim=MAX_IMAGE_DIM):
     """
     Convert an image to base64 encoding for API transmission.
-    Handles RGBA conversion to RGB for JPEG encoding.
+    Converts images to RGB when their mode cannot be saved as JPEG.
+    Images larger than max_dim on their longest side are downscaled first.
+    The original file is sent as is only if it is a small enough JPEG, never for
+    an image decoded at reduced scale (see image_utils.open_image).
+    
+    Args:
+        image (PIL.Image): The image to encode
+        raw_bytes (bytes): Optional original file contents of the image
+        source_format (str): Optional format of raw_bytes (e.g. 'JPEG')
+        max_dim (int): Maximum width/height of the encoded image
     """
+    too_large = max(image.size) > max_dim
+    # Size of the original file, larger than the image when it was decoded at reduced scale
+    original_size = image.info.get("original_size", image.size)
+    
+    # The original file is already a small enough JPEG (in pixels and bytes), so send it as is instead of re-encoding
+    if (raw_bytes is not None and source_format == 'JPEG' and image.mode in ('RGB', 'L')
+            and max(original_size) <= max_dim and len(raw_bytes) <= MAX_RAW_IMAGE_BYTES):
+        return _b64.b64encode(raw_bytes).decode('ascii')
+    
     buffered = io.BytesIO()
     
-    # Convert RGBA images to RGB before encoding as JPEG
-    if image.mode == 'RGBA':
+    # Downscale large images (e.g. phone photos), working on a copy to keep the caller's image intact
+    if too_large:
+        image = image.copy()
+        image.thumbnail((max_dim, max_dim), Image.LANCZOS)
+    
+    # JPEG only supports RGB and grayscale, so convert any other mode (RGBA, LA, P, CMYK...)
+    if image.mode not in ('RGB', 'L'):
         image = image.convert('RGB')
         
-    image.save(buffered, format="JPEG")
-    return base64.b64encode(buffered.getvalue()).decode('utf-8')
+    image.save(buffered, format="JPEG", quality=85, optimize=True, progressive=True)
+    # getbuffer() avoids copying the JPEG data; base64 output is always plain ASCII
+    return _b64.b64encode(buffered.getbuffer()).decode('ascii')
 
-def call_claude_api(api_key, invoice_image, signatories, signature_images):
+def _encode_invoice(invoice_image, invoice_bytes=None):
     """
-    Call the Claude API to verify an invoice.
+    Encode an invoice image, reusing the result when the same invoice is verified again.
+    The cache is keyed by a hash of the original file contents, or of the decoded
+    pixels when the file contents are not available.
     
-    Args:
-        api_key (str): Anthropic API key
-        invoice_image (PIL.Image): The invoice image to verify
-        signatories (dict): Dictionary of authorized signatories and their max amounts
-        signature_images (dict): Dictionary of signature reference images
-        
     Returns:
-        dict: The API response or error information
+        tuple: The base64 data and its media type
     """
-    url = "https://api.anthropic.com/v1/messages"
+    if invoice_bytes is not None:
+        digest = hashlib.blake2b(invoice_bytes, digest_size=16, person=b"file").digest()
+    else:
+        pixels = hashlib.blake2b(digest_size=16, person=b"pixels")
+        pixels.update(f"{invoice_image.mode}:{invoice_image.size}".encode('ascii'))
+        pixels.update(invoice_image.tobytes())
+        digest = pixels.digest()
     
-    # Format signatories info
-    signatories_info = "רשימת מורשי החתימה:\n"
-    for name, amount in signatories.items():
-        signatories_info += f"- {name}: עד {amount} ש״ח\n"
+    with _INVOICE_CACHE_LOCK:
+        cached = _INVOICE_CACHE.get(digest)
+        if cached is not None:
+            _INVOICE_CACHE.move_to_end(digest)
+            return cached
+    
+    # PNG files are also accepted by the API, so small enough ones (in pixels and bytes) are sent as is
+    if (invoice_bytes is not None and invoice_image.format == 'PNG'
+            and max(invoice_image.size) <= MAX_IMAGE_DIM and len(invoice_bytes) <= MAX_RAW_IMAGE_BYTES):
+        encoded = (_b64.b64encode(invoice_bytes).decode('ascii'), "image/png")
+    else:
+        encoded = (encode_image(invoice_image, raw_bytes=invoice_bytes, source_format=invoice_image.format), "image/jpeg")
+    with _INVOICE_CACHE_LOCK:
+        _INVOICE_CACHE[digest] = encoded
+        if len(_INVOICE_CACHE) > INVOICE_CACHE_SIZE:
+            _INVOICE_CACHE.popitem(last=False)
+    return encoded
+
+def _get_cached_encoded(image):
+    """
+    Return the base64 encoding of a signature reference image, encoding it only once.
+    The result is stored on the image object itself so it lives as long as the image.
+    Reference signatures are not modified in place, so the cache is never invalidated.
+    """
+    cached = getattr(image, "_cached_b64", None)
+    if cached is None:
+        cached = encode_image(image)
+        image._cached_b64 = cached
+    return cached
+
+@functools.lru_cache(maxsize=16)
+def _signatories_info_for(signatory_items):
+    """Build the signatories prompt text for a tuple of (name, amount) pairs."""
+    return "רשימת מורשי החתימה:\n" + "".join(f"- {name}: עד {amount} ש״ח\n" for name, amount in signatory_items)
+
+def _format_signatories_info(signatories):
+    """Format the authorized signatories list for the prompt."""
+    # Signatories rarely change between invoices, so the text is memoized
+    return _signatories_info_for(tuple(signatories.items()))
+
+def _image_block(image_base64, media_type="image/jpeg"):
+    """Build an image content block from a base64 encoded image (JPEG by default)."""
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": media_type,
+            "data": image_base64
+        }
+    }
+
+def _signature_content_items(signature_images):
+    """Build the content items for the signature reference images."""
+    content_items = []
+    for name, sig_image in ((n, s) for n, s in signature_images.items() if s is not None):
+        try:
+            signature_base64 = _get_cached_encoded(sig_image)
+        except Exception as e:
+            # Continue even if one signature fails to encode (without leaving its label behind)
+            print(f"Warning: Failed to encode signature for {name}: {e}")
+            continue
+        content_items.extend((
+            {"type": "text", "text": f"דוגמת חתימה של {name}:"},
+            _image_block(signature_base64)
+        ))
+    return content_items
+
+def _request_data(content_items, max_tokens=1000):
+    """Wrap content items in a Messages API payload."""
+    return {
+        "model": "claude-3-7-sonnet-20250219", #"claude-3-5-sonnet-20240620"
+        "system": get_system_prompt(),
+        "max_tokens": max_tokens,
+        "temperature": 0,  # Set to 0 for deterministic responses
+        "messages": [
+            {
+                "role": "user",
+                "content": content_items
+            }
+        ]
+    }
+
+def _build_request_data(invoice_image, signatories, signature_images, invoice_bytes=None):
+    """
+    Build the Messages API payload for verifying a single invoice.
+    invoice_bytes are the original file contents, used to skip re-encoding JPEG files.
+    
+    Raises:
+        Exception: If the invoice image cannot be encoded
+    """
+    signatories_info = _format_signatories_info(signatories)
     
     # Create content items starting with text
     content_items = [
@@ -98,92 +304,314 @@ def call_claude_api(api_key, invoice_image, signatories, signature_images):
     ]
     
     # Add invoice image
-    try:
-        invoice_base64 = encode_image(invoice_image)
+    content_items.append(_image_block(*_encode_invoice(invoice_image, invoice_bytes)))
+    
+    # Add signature reference images if available
+    content_items.extend(_signature_content_items(signature_images))
+    
+    return _request_data(content_items)
+
+def _build_batch_request_data(invoice_images, signatories, signature_images):
+    """
+    Build a single Messages API payload verifying several invoices at once.
+    The prompt and signature references are sent once for the whole batch.
+    
+    Raises:
+        Exception: If one of the invoice images cannot be encoded
+    """
+    signatories_info = _format_signatories_info(signatories)
+    
+    content_items = [
+        {
+            "type": "text",
+            "text": f"אנא בדוק כל אחת מ-{len(invoice_images)} החשבוניות הבאות. האם הן עומדות בכל הדרישות?\n\n"
+                    "חשוב מאוד: החזר אך ורק מערך JSON עם אובייקט אחד לכל חשבונית, בפורמט הבא:\n"
+                    '[{"index": 1, "amount": "סכום החשבונית", "signer": "שם מורשה החתימה או null", "status": "תקין/לא תקין/לא ברור"}]\n\n'
+                    f"{signatories_info}"
+        }
+    ]
+    
+    # Add invoice images, each preceded by its number
+    for index, invoice_image in enumerate(invoice_images, start=1):
         content_items.append({
-            "type": "image",
-            "source": {
-                "type": "base64",
-                "media_type": "image/jpeg",
-                "data": invoice_base64
-            }
+            "type": "text",
+            "text": f"חשבונית #{index}:"
         })
+        content_items.append(_image_block(encode_image(invoice_image)))
+    
+    # Add signature reference images once for all invoices
+    content_items.extend(_signature_content_items(signature_images))
+    
+    return _request_data(content_items, max_tokens=BATCH_TOKENS_PER_INVOICE * len(invoice_images) + 200)
+
+def _loads(content):
+    """Parse a JSON response body, using orjson when it is available."""
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers handle both the same way
+    if ORJSON_SUPPORT:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _dumps(data):
+    """
+    Serialize a request payload to UTF-8 JSON bytes in one pass, using orjson when available.
+    The bytes are sent as the request body as is (content-type is set on the client).
+    """
+    if ORJSON_SUPPORT:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+def _read_stream(response, stop_at_status=True):
+    """
+    Collect a streamed (server-sent events) Messages API response.
+    
+    Args:
+        response (requests.Response): Response opened with stream=True
+        stop_at_status (bool): Stop reading as soon as the STATUS line has arrived
+        
+    Returns:
+        dict: The response in the same shape as a non-streamed response
+    """
+    response_data = {}
+    text_parts = []
+    tail = ""
+    try:
+        for line in response.iter_lines():
+            if not line.startswith(b"data:"):
+                continue
+            event = _loads(line[5:])
+            if event.get("type") == "message_start":
+                response_data = event.get("message", {})
+            elif event.get("type") == "content_block_delta" and event["delta"].get("type") == "text_delta":
+                delta = event["delta"]["text"]
+                text_parts.append(delta)
+                if stop_at_status:
+                    # Only search the new text plus enough of the previous text for a STATUS line split across deltas
+                    tail = tail[-_STATUS_TAIL_CHARS:] + delta
+                    if _STATUS_RE.search(tail):
+                        break
+            elif event.get("type") == "error":
+                raise requests.exceptions.RequestException(event.get("error", {}).get("message", "stream error"))
+    finally:
+        response.close()
+    
+    response_data["content"] = [{"type": "text", "text": "".join(text_parts)}]
+    return response_data
+
+def _extract_text(response_data):
+    """Join the text blocks of a Messages API response."""
+    return "".join(item["text"] for item in response_data.get("content", []) if item["type"] == "text")
+
+def _parse_response(response_data):
+    """Extract Claude's text response and attach the parsed status code."""
+    status_code = "unclear"  # Default status
+    
+    # print("Response Data:", response_data)  # Debugging line
+
+    if "content" in response_data:
+        result_text = _extract_text(response_data)
+        
+        # Parse the status from the response
+        match = _STATUS_RE.search(result_text)
+        if match:
+            status_code = STATUS_CODES[match.group(1)]
+        
+    # Add the status code to the response
+    response_data["status_code"] = status_code
+    
+    return response_data
+
+def _parse_batch_response(response_data, count):
+    """
+    Parse the JSON array returned for a batch request.
+    
+    Returns:
+        list: One result dict per invoice with index, amount, signer, status and status_code
+    """
+    result_text = _extract_text(response_data)
+    
+    # Claude may wrap the array in prose or a code block (which can itself contain
+    # brackets, e.g. "STATUS: [תקין]"), so use the first well-formed array of objects
+    items = []
+    decoder = json.JSONDecoder()
+    array_start = result_text.find("[")
+    while array_start != -1:
+        try:
+            candidate, _ = decoder.raw_decode(result_text, array_start)
+        except json.JSONDecodeError:
+            candidate = None
+        if isinstance(candidate, list) and any(isinstance(item, dict) for item in candidate):
+            items = candidate
+            break
+        array_start = result_text.find("[", array_start + 1)
+    
+    by_index = {}
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get("index"), int):
+            by_index[item["index"]] = item
+    
+    results = []
+    for index in range(1, count + 1):
+        item = by_index.get(index, {})
+        status = item.get("status")
+        if not isinstance(status, str):
+            status = None
+        results.append({
+            "index": index,
+            "amount": item.get("amount"),
+            "signer": item.get("signer"),
+            "status": status,
+            "status_code": STATUS_CODES.get(status, "unclear")
+        })
+    return results
+
+def call_claude_api(api_key, invoice_image, signatories, signature_images, invoice_bytes=None, stream=False):
+    """
+    Call the Claude API to verify an invoice.
+    
+    Args:
+        api_key (str): Anthropic API key
+        invoice_image (PIL.Image): The invoice image to verify
+        signatories (dict): Dictionary of authorized signatories and their max amounts
+        signature_images (dict): Dictionary of signature reference images
+        invoice_bytes (bytes): Optional original file contents of the invoice image
+        stream (bool): Stream the answer and stop reading once the STATUS line arrives
+        
+    Returns:
+        dict: The API response or error information
+    """
+    try:
+        data = _build_request_data(invoice_image, signatories, signature_images, invoice_bytes)
     except Exception as e:
         return {"error": f"שגיאה בקידוד תמונת החשבונית: {str(e)}"}
+    if stream:
+        data["stream"] = True
     
-    # Add signature reference images if available
-    for name, sig_image in signature_images.items():
-        if sig_image is not None:
-            try:
-                content_items.append({
-                    "type": "text",
-                    "text": f"דוגמת חתימה של {name}:"
-                })
-                signature_base64 = encode_image(sig_image)
-                content_items.append({
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": "image/jpeg",
-                        "data": signature_base64
-                    }
-                })
-            except Exception as e:
-                # Continue even if one signature fails to encode
-                print(f"Warning: Failed to encode signature for {name}: {e}")
-    
-    # Headers
+    # Headers (anthropic-version and content-type are set on the session)
     headers = {
-        "x-api-key": api_key,
-        "anthropic-version": "2023-06-01",
-        "content-type": "application/json"
-    }
-    
-    # Data payload
-    data = {
-        "model": "claude-3-7-sonnet-20250219", #"claude-3-5-sonnet-20240620"
-        "system": get_system_prompt(),
-        "max_tokens": 1000,
-        "temperature": 0,  # Set to 0 for deterministic responses
-        "messages": [
-            {
-                "role": "user",
-                "content": content_items
-            }
-        ]
+        "x-api-key": api_key
     }
     
     # Make the API call
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=60)
+        response = _SESSION.post(API_URL, headers=headers, data=_dumps(data), timeout=REQUEST_TIMEOUT, stream=stream)
         response.raise_for_status()  # Raise an exception for HTTP errors
-        response_data = response.json()
+        if stream:
+            return _parse_response(_read_stream(response))
+        return _parse_response(_loads(response.content))
+        
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"שגיאה בשליחת הבקשה לAPI: {str(e)}",
+            "status": "error",
+            "status_code": "error"
+        }
+    except json.JSONDecodeError:
+        return {
+            "error": f"שגיאה בקריאת תשובת API",
+            "status": "error",
+            "status_code": "error"
+        }
+
+def call_claude_api_batch(api_key, invoice_images, signatories, signature_images, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Verify several invoices with one API request per batch_size invoices.
+    
+    Args:
+        api_key (str): Anthropic API key
+        invoice_images (list): The invoice images (PIL.Image) to verify
+        signatories (dict): Dictionary of authorized signatories and their max amounts
+        signature_images (dict): Dictionary of signature reference images
+        batch_size (int): Maximum number of invoices sent in a single request
         
-        # Extract Claude's text response
-        result_text = ""
-        status_code = "unclear"  # Default status
+    Returns:
+        list: One result dict (or error dict) per invoice, in the same order
+    """
+    headers = {
+        "x-api-key": api_key
+    }
+    
+    results = []
+    for batch_start in range(0, len(invoice_images), batch_size):
+        batch = invoice_images[batch_start:batch_start + batch_size]
         
-        # print("Response Data:", response_data)  # Debugging line
-
-        if "content" in response_data:
-            for item in response_data["content"]:
-                if item["type"] == "text":
-                    result_text += item["text"]
-            
-            # Parse the status from the response
-            if "STATUS: תקין" in result_text:
-                status_code = "valid"
-            elif "STATUS: לא תקין" in result_text:
-                status_code = "invalid"
-            elif "STATUS: לא ברור" in result_text:
-                status_code = "unclear"
-            
-        # Add the status code to the response
-        response_data["status_code"] = status_code
+        try:
+            data = _build_batch_request_data(batch, signatories, signature_images)
+        except Exception as e:
+            error = {"error": f"שגיאה בקידוד תמונת החשבונית: {str(e)}"}
+            results.extend(dict(error) for _ in batch)
+            continue
         
-        return response_data
+        try:
+            response = _SESSION.post(API_URL, headers=headers, data=_dumps(data), timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            batch_results = _parse_batch_response(_loads(response.content), len(batch))
+        except requests.exceptions.RequestException as e:
+            error = {
+                "error": f"שגיאה בשליחת הבקשה לAPI: {str(e)}",
+                "status": "error",
+                "status_code": "error"
+            }
+            batch_results = [dict(error) for _ in batch]
+        except json.JSONDecodeError:
+            error = {
+                "error": f"שגיאה בקריאת תשובת API",
+                "status": "error",
+                "status_code": "error"
+            }
+            batch_results = [dict(error) for _ in batch]
         
-    except requests.exceptions.RequestException as e:
+        # Report indexes relative to the whole list rather than the batch
+        for result in batch_results:
+            if "index" in result:
+                result["index"] += batch_start
+        results.extend(batch_results)
+    
+    return results
+
+def create_async_client():
+    """
+    Create an httpx.AsyncClient for concurrent invoice verification.
+    The client should be reused across calls so connections are kept alive.
+    HTTP/2 is used when the h2 package is installed.
+    """
+    if not HTTPX_SUPPORT:
+        raise ImportError("httpx module not installed. Please install it using 'pip install httpx'")
+    # With HTTP/2 concurrent requests are multiplexed over a single TLS connection,
+    # so only a few connections are needed
+    return httpx.AsyncClient(
+        http2=HTTP2_SUPPORT,
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=8),
+        headers=_STATIC_HEADERS,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0])
+    )
+
+async def call_claude_api_async(client, api_key, invoice_image, signatories, signature_images, invoice_bytes=None):
+    """
+    Asynchronous version of call_claude_api.
+    
+    Args:
+        client (httpx.AsyncClient): Client created by create_async_client
+        api_key (str): Anthropic API key
+        invoice_image (PIL.Image): The invoice image to verify
+        signatories (dict): Dictionary of authorized signatories and their max amounts
+        signature_images (dict): Dictionary of signature reference images
+        invoice_bytes (bytes): Optional original file contents of the invoice image
+        
+    Returns:
+        dict: The API response or error information
+    """
+    # Resizing and encoding are CPU work, so they run in a thread to keep other requests going
+    try:
+        data = await asyncio.to_thread(_build_request_data, invoice_image, signatories, signature_images, invoice_bytes)
+    except Exception as e:
+        return {"error": f"שגיאה בקידוד תמונת החשבונית: {str(e)}"}
+    
+    try:
+        response = await client.post(API_URL, headers={"x-api-key": api_key}, content=_dumps(data))
+        response.raise_for_status()
+        return _parse_response(_loads(response.content))
+        
+    except httpx.HTTPError as e:
         return {
             "error": f"שגיאה בשליחת הבקשה לAPI: {str(e)}",
             "status": "error",
@@ -196,6 +624,40 @@ def call_claude_api(api_key, invoice_image, signatories, signature_images):
             "status_code": "error"
         }
 
+async def verify_many(api_key, invoice_images, signatories, signature_images, max_concurrency=4, client=None, invoice_bytes=None):
+    """
+    Verify several invoices concurrently.
+    
+    Args:
+        api_key (str): Anthropic API key
+        invoice_images (list): The invoice images (PIL.Image) to verify
+        signatories (dict): Dictionary of authorized signatories and their max amounts
+        signature_images (dict): Dictionary of signature reference images
+        max_concurrency (int): Maximum number of requests in flight at once
+        client (httpx.AsyncClient): Optional client to reuse; one is created if not given
+        invoice_bytes (list): Optional original file contents of each invoice image (or None)
+        
+    Returns:
+        list: One API response or error dict per invoice, in the same order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    owns_client = client is None
+    if owns_client:
+        client = create_async_client()
+    
+    if invoice_bytes is None:
+        invoice_bytes = [None] * len(invoice_images)
+    
+    async def verify_one(invoice_image, image_bytes):
+        async with semaphore:
+            return await call_claude_api_async(client, api_key, invoice_image, signatories, signature_images, image_bytes)
+    
+    try:
+        return await asyncio.gather(*[verify_one(image, image_bytes) for image, image_bytes in zip(invoice_images, invoice_bytes)])
+    finally:
+        if owns_client:
+            await client.aclose()
+
 def get_api_key():
     """
     Get the Anthropic API key from environment variables.
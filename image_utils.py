@@ -14,12 +14,21 @@ try:
 except ImportError:
     HEIF_SUPPORT = False
 
-def open_image(file_or_path):
+# Phone photos can exceed Pillow's default decompression bomb limit (~89MP) and
+# trigger warnings; raise the limit while still rejecting absurdly large images
+Image.MAX_IMAGE_PIXELS = 200_000_000
+
+def open_image(file_or_path, max_dim=None):
     """
     Open an image file in various formats including WEBP and HEIC
     
     Args:
         file_or_path: A file-like object or path to an image file
+        max_dim: Optional target size of the longest side. JPEG files are then
+            decoded directly at 1/2, 1/4 or 1/8 scale while the longest side stays
+            at least max_dim, which is much faster than decoding the full
+            resolution. The result still needs resizing to exactly max_dim, and
+            its info["original_size"] then holds the size of the file.
     
     Returns:
         PIL.Image: The opened image
@@ -27,21 +36,20 @@ def open_image(file_or_path):
     Raises:
         Exception: If the image cannot be opened
     """
-    # First try standard PIL.Image.open
+    # HEIF support (if available) is registered at import, so a single attempt covers all formats
     try:
         image = Image.open(file_or_path)
+        if max_dim and image.format == "JPEG" and max(image.size) > max_dim:
+            # draft() keeps both sides at least as large as the requested box, so the
+            # box must follow the aspect ratio for the longest side to be reduced
+            scale = max_dim / max(image.size)
+            width, height = image.size
+            image.draft("RGB", (max(1, int(width * scale)), max(1, int(height * scale))))
+            image.info["original_size"] = (width, height)
         # Force load the image to make sure it's valid
         image.load()
         return image
     except Exception as e:
-        # If we have HEIF support and standard open failed, maybe it's a special format
         if HEIF_SUPPORT:
-            try:
-                # Try again, now with HEIF registration in place
-                image = Image.open(file_or_path)
-                image.load()
-                return image
-            except Exception as heif_e:
-                raise Exception(f"לא ניתן לפתוח את הקובץ: {str(e)}. נסיון HEIF נכשל: {str(heif_e)}")
-        else:
-            raise Exception(f"לא ניתן לפתוח את הקובץ: {str(e)}. תמיכה בפורמט HEIC/HEIF לא זמינה.")
+            raise Exception(f"לא ניתן לפתוח את הקובץ: {str(e)}")
+        raise Exception(f"לא ניתן לפתוח את הקובץ: {str(e)}. תמיכה בפורמט HEIC/HEIF לא זמינה.")
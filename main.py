@@ -8,105 +8,290 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-import requests
 import json
 import base64
+import functools
+import math
 import os
+import re
 import pathlib
-import glob
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import io
 from dotenv import load_dotenv
 
 # Import our Claude API handler
 import claude_api
+# Image helpers; importing registers the pillow-heif opener for HEIC/HEIF files
+import image_utils
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Constants
 SIGNATORIES_FILE = "authorized_signatories.json"
+STYLES_FILE = "styles.css"
 SIGNATURES_DIR = "signatures"
+SIGNATURE_THUMBS_DIR = os.path.join(SIGNATURES_DIR, "thumbs")
+SIGNATURE_THUMB_SIZE = 150  # Sidebar display width of signatures
+SIGNATORIES_PAGE_SIZE = 10  # Signatories shown per page in the sidebar
 BACKUPS_DIR = "backups"
 SAMPLE_INVOICES_DIR = "invoice"  # Directory for sample invoices
+BROWSER_IMAGE_TYPES = {'image/jpeg', 'image/png', 'image/webp'}  # Uploads shown without re-encoding
+PREVIEW_MAX_SIDE = 1200  # Longest side of invoice previews shown in the page
+EXPECTED_VERIFICATION_SECONDS = 15  # Typical API response time, used for the progress bar
+SAMPLE_INVOICE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.heic', '.heif'}
+
+# Keywords looked for in Claude's answer, classified by group name in a single scan
+RESULT_KEYWORDS_RE = re.compile(r"(?P<invalid>לא תקין)|(?P<unclear>לא ברור)|(?P<noident>לא ניתן לזהות|לא זוהתה חתימה)")
 
 # Ensure directories exist
 os.makedirs(SIGNATURES_DIR, exist_ok=True)
+os.makedirs(SIGNATURE_THUMBS_DIR, exist_ok=True)
 os.makedirs(BACKUPS_DIR, exist_ok=True)
 os.makedirs(SAMPLE_INVOICES_DIR, exist_ok=True)  # Create sample invoice directory if it doesn't exist
 
 # Function to get sample invoices
 def get_sample_invoices():
     """Get list of sample invoice files from the invoice directory"""
-    samples = []
-    
-    # Get all image files in the invoice directory
-    for ext in ['*.jpg', '*.jpeg', '*.png', '*.webp', '*.heic', '*.heif']:
-        pattern = os.path.join(SAMPLE_INVOICES_DIR, ext)
-        samples.extend(glob.glob(pattern))
-    
-    # Sort files by name
-    samples.sort()
-    
-    return samples
+    return _list_sample_invoices(SAMPLE_INVOICES_DIR, os.path.getmtime(SAMPLE_INVOICES_DIR))
+
+# The directory listing is cached per directory modification time (added/removed files)
+@st.cache_data(ttl=30)
+def _list_sample_invoices(directory, mtime):
+    # Single pass over the directory, keeping image files sorted by name
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in SAMPLE_INVOICE_EXTENSIONS
+        )
+
+# Function to get the thumbnail file path of a signatory's signature
+def get_signature_thumb_path(name):
+    return f"{SIGNATURE_THUMBS_DIR}/{name.replace(' ', '_').replace('/', '_')}_signature.png"
+
+# Function to save a small thumbnail of a signature, so the sidebar doesn't send the full
+# image on every rerun. Returns the thumbnail path, or None if it couldn't be saved
+def save_signature_thumbnail(name, img):
+    thumb_path = get_signature_thumb_path(name)
+    try:
+        thumb = img.copy()
+        thumb.thumbnail((SIGNATURE_THUMB_SIZE, SIGNATURE_THUMB_SIZE))
+        thumb.save(thumb_path)
+        return thumb_path
+    except Exception:
+        # Drop any outdated thumbnail so the sidebar falls back to the full image
+        if os.path.exists(thumb_path):
+            os.remove(thumb_path)
+        return None
+
+# Function to check that a saved thumbnail exists and is not older than its signature image
+# (which may have been replaced outside the app)
+def is_thumbnail_current(thumb_path, image_path):
+    return (bool(thumb_path) and os.path.exists(thumb_path)
+            and os.path.getmtime(thumb_path) >= os.path.getmtime(image_path))
+
+# Function to get the signature to display in the sidebar: the thumbnail file if saved, otherwise the image
+def get_signature_display(name):
+    thumb_path = st.session_state.signature_thumbs.get(name)
+    if thumb_path:
+        return thumb_path
+    return st.session_state.signature_images[name]
 
 # Function to create backup of signatories file
 def backup_signatories_file():
     if os.path.exists(SIGNATORIES_FILE):
         from datetime import datetime
+        import heapq
         import shutil
         
         # Create timestamped backup filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = f"{BACKUPS_DIR}/signatories_backup_{timestamp}.json"
         
-        # Copy file to backup
-        shutil.copy2(SIGNATORIES_FILE, backup_file)
+        # Hardlink the file as backup (no data copied). This is safe because saving replaces
+        # the signatories file with a new one instead of writing into it. Fall back to a plain
+        # copy where hardlinks aren't possible (other filesystem, no support)
+        try:
+            os.link(SIGNATORIES_FILE, backup_file)
+        except OSError:
+            shutil.copyfile(SIGNATORIES_FILE, backup_file)
         
-        # Keep only the 5 most recent backups
-        backups = sorted([f for f in os.listdir(BACKUPS_DIR) if f.startswith("signatories_backup_")])
-        for old_backup in backups[:-5]:  # Remove all but the 5 newest
-            try:
-                os.remove(os.path.join(BACKUPS_DIR, old_backup))
-            except:
-                pass
+        # Keep only the 5 most recent backups (timestamped names sort chronologically)
+        with os.scandir(BACKUPS_DIR) as entries:
+            backups = [e for e in entries if e.name.startswith("signatories_backup_")]
+        keep = {e.name for e in heapq.nlargest(5, backups, key=lambda e: e.name)}
+        for old_backup in backups:  # Remove all but the 5 newest
+            if old_backup.name not in keep:
+                try:
+                    os.remove(old_backup.path)
+                except:
+                    pass
+
+# Function to composite transparent images over a white background. Done once when the
+# image is opened, so later JPEG encoding doesn't blend transparent areas (e.g. around
+# a signature) to black
+def flatten_transparency(image):
+    if image.mode == 'P' and 'transparency' in image.info:
+        image = image.convert('RGBA')
+    if image.mode in ('RGBA', 'LA'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image.convert('RGB'), mask=image.getchannel('A'))
+        return background
+    return image
 
 # Function to safely open image files in various formats
-def safe_open_image(file):
+# (max_dim lets large JPEG files decode at reduced scale, see image_utils.open_image)
+def safe_open_image(file, max_dim=None):
     try:
-        image = Image.open(file)
-        # For HEIC/HEIF images from iPhone, they might need conversion
-        if hasattr(image, 'format') and image.format in ['HEIC', 'HEIF']:
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-        return image
+        # HEIC/HEIF images from iPhone decode natively once pillow-heif is registered (see image_utils)
+        image = image_utils.open_image(file, max_dim=max_dim)
+        return flatten_transparency(image)
     except Exception as e:
         st.error(f"שגיאה בפתיחת הקובץ: {str(e)}")
-        st.info("אם הקובץ הוא בפורמט HEIC (תמונה מאייפון), ייתכן שתצטרך להמירו ל-JPEG לפני העלאה.")
+        if not image_utils.HEIF_SUPPORT:
+            st.info("אם הקובץ הוא בפורמט HEIC (תמונה מאייפון), ייתכן שתצטרך להמירו ל-JPEG לפני העלאה.")
         return None
 
+# Function to read the app stylesheet once per process
+@st.cache_data
+def load_css():
+    with open(STYLES_FILE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+# Function to build a regex matching any of the signatory names (longest first, so
+# a name that is a prefix of another doesn't shadow it), compiled once per set of names
+@functools.lru_cache(maxsize=16)
+def signatory_names_pattern(names):
+    return re.compile("|".join(map(re.escape, sorted(names, key=len, reverse=True))))
+
+# Shared worker threads for API calls, so the UI keeps responding while Claude analyzes the invoice.
+# Each session runs at most one call at a time (see abandon_verification), so this is the
+# number of sessions that can verify concurrently
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=4)
+
+# Function run in a worker thread to verify an invoice. A sample invoice given by
+# invoice_path is read and decoded here, off the UI thread; errors reach the dialog
+# through the future
+def verify_invoice(api_key, invoice_image, invoice_bytes, invoice_path, signatories, signature_images):
+    if invoice_path is not None:
+        with open(invoice_path, 'rb') as f:
+            invoice_bytes = f.read()
+        invoice_image = flatten_transparency(image_utils.open_image(io.BytesIO(invoice_bytes), max_dim=claude_api.MAX_IMAGE_DIM))
+    return claude_api.call_claude_api(
+        api_key=api_key,
+        invoice_image=invoice_image,
+        signatories=signatories,
+        signature_images=signature_images,
+        invoice_bytes=invoice_bytes
+    )
+
+# Function to drop the session's running verification (cancelled or dialog closed). A running
+# API call can't be interrupted, so it is remembered until it finishes and the next
+# verification of this session waits for it instead of taking another worker
+def abandon_verification():
+    future = st.session_state.get("verification_future")
+    if future is not None and not future.done():
+        st.session_state.abandoned_verification = future
+    st.session_state.verification_future = None
+
+# Separate worker threads for decoding sample invoices ahead of time, so prefetching never delays an API call
+@st.cache_resource
+def get_prefetch_executor():
+    return ThreadPoolExecutor(max_workers=2)
+
+# Function to build the previews of all sample invoices in the background while the user is
+# choosing one. Only the small previews are cached; a preview that fails raises instead of
+# being cached, so the error is shown when that sample is selected.
+# Cached per list of files, so it runs once per process (and again when files are added or removed)
+@st.cache_resource
+def prefetch_sample_invoices(paths):
+    # The cache is fetched here, since the worker threads have no Streamlit script context
+    previews = get_preview_cache()
+    return [get_prefetch_executor().submit(_cached_preview_bytes, previews, path) for path in paths]
+
+# Decoded image files are shared across reruns and sessions; the modification
+# time is part of the key so a changed file is decoded again
+@st.cache_resource(max_entries=128)
+def _open_cached(path, mtime):
+    return safe_open_image(path)
+
+# Function to open an image file from disk through the cache
+def open_image_path(path):
+    return _open_cached(path, os.path.getmtime(path))
+
+# Display-sized JPEG of an image file, so browsing samples doesn't send full-resolution
+# images to the browser on every rerun. JPEG files are decoded directly at reduced scale
+def _preview_bytes(path, max_side):
+    image = flatten_transparency(image_utils.open_image(path, max_dim=max_side))
+    image.thumbnail((max_side, max_side))
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=80)
+    return buffered.getvalue()
+
+# Function to choose what to pass to st.image for an uploaded file: the original bytes when
+# the browser can show them directly (no PNG re-encoding by Streamlit), otherwise the image
+def get_display_image(image, raw_bytes, mime_type):
+    if mime_type in BROWSER_IMAGE_TYPES:
+        return raw_bytes
+    return image
+
+# Previews shared across reruns and sessions, as {path: (mtime, bytes)} with a lock. A plain
+# dict rather than st.cache_data, so the prefetch threads can fill it without a script context
+@st.cache_resource
+def get_preview_cache():
+    return {}, threading.Lock()
+
+# Function to get the preview of a file from the cache, building it if missing or the file changed
+def _cached_preview_bytes(previews, path):
+    cache, lock = previews
+    mtime = os.path.getmtime(path)
+    with lock:
+        cached = cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    preview = _preview_bytes(path, PREVIEW_MAX_SIDE)
+    with lock:
+        cache[path] = (mtime, preview)
+    return preview
+
+# Function to get the preview image of a file from disk
+def get_preview_bytes(path):
+    return _cached_preview_bytes(get_preview_cache(), path)
+
 # Function to encode image to base64
 def encode_image(image):
     buffered = io.BytesIO()
     
-    # Convert RGBA images to RGB before encoding as JPEG
-    if image.mode == 'RGBA':
+    # JPEG only supports RGB and grayscale, so convert any other mode (RGBA, LA, P, CMYK...)
+    if image.mode not in ('RGB', 'L'):
         image = image.convert('RGB')
         
     image.save(buffered, format="JPEG")
     return base64.b64encode(buffered.getvalue()).decode('utf-8')
 
+# Parse the signatories JSON file once per modification time (st.cache_data hands out copies)
+@st.cache_data
+def _read_signatories_json(path, mtime):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 # Load authorized signatories from JSON file
 def load_signatories():
     try:
         if os.path.exists(SIGNATORIES_FILE):
-            with open(SIGNATORIES_FILE, 'r', encoding='utf-8') as f:
-                signatories_data = json.load(f)
+            signatories_data = _read_signatories_json(SIGNATORIES_FILE, os.path.getmtime(SIGNATORIES_FILE))
             
             # Convert to the format used in the app
             signatories = {}
             signature_images = {}
+            signature_thumbs = {}
             missing_images = []
             
             for name, data in signatories_data.items():
@@ -117,7 +302,15 @@ def load_signatories():
                     image_path = data['signature_image_path']
                     if os.path.exists(image_path):
                         try:
-                            signature_images[name] = safe_open_image(image_path)
+                            signature_images[name] = open_image_path(image_path)
+                            
+                            # Use the saved thumbnail (or the default location for files saved without
+                            # one), rebuilding it only if missing or outdated
+                            thumb_path = data.get('thumbnail_path') or get_signature_thumb_path(name)
+                            if not is_thumbnail_current(thumb_path, image_path) and signature_images[name]:
+                                thumb_path = save_signature_thumbnail(name, signature_images[name])
+                            if thumb_path:
+                                signature_thumbs[name] = thumb_path
                         except Exception as e:
                             missing_images.append(f"{name} (שגיאה: {str(e)})")
                     else:
@@ -128,11 +321,11 @@ def load_signatories():
                 missing_list = "\n".join(missing_images)
                 st.warning(f"לא ניתן היה לטעון את תמונות החתימה הבאות:\n{missing_list}")
             
-            return signatories, signature_images
-        return {}, {}
+            return signatories, signature_images, signature_thumbs
+        return {}, {}, {}
     except Exception as e:
         st.error(f"שגיאה בטעינת מורשי החתימה: {str(e)}")
-        return {}, {}
+        return {}, {}, {}
 
 # Save authorized signatories to JSON file
 def save_signatories(signatories, signature_images):
@@ -142,11 +335,29 @@ def save_signatories(signatories, signature_images):
         
         signatories_data = {}
         
+        # Previously saved entries, so unchanged signature images are not written again
+        previous_data = {}
+        if os.path.exists(SIGNATORIES_FILE):
+            previous_data = _read_signatories_json(SIGNATORIES_FILE, os.path.getmtime(SIGNATORIES_FILE))
+        dirty = st.session_state.get("signature_dirty", set())
+        
         for name, amount in signatories.items():
             signatories_data[name] = {
                 "max_amount": amount
             }
             
+            # Reuse the saved file if the signature image did not change
+            previous = previous_data.get(name, {})
+            previous_path = previous.get("signature_image_path")
+            if name not in dirty and name in signature_images and previous_path and os.path.exists(previous_path):
+                signatories_data[name]["signature_image_path"] = previous_path
+                thumb_path = previous.get("thumbnail_path") or get_signature_thumb_path(name)
+                if not is_thumbnail_current(thumb_path, previous_path):
+                    thumb_path = save_signature_thumbnail(name, signature_images[name])
+                if thumb_path:
+                    signatories_data[name]["thumbnail_path"] = thumb_path
+                continue
+            
             # Save signature image if available
             if name in signature_images and signature_images[name] is not None:
                 # Determine file extension based on image format
@@ -174,10 +385,26 @@ def save_signatories(signatories, signature_images):
                         signatories_data[name]["signature_image_path"] = alt_filename
                     except:
                         st.warning(f"לא ניתן לשמור את תמונת החתימה של {name}: {str(img_error)}")
+                
+                # Save a small thumbnail for the sidebar so the full image isn't sent on every rerun
+                if "signature_image_path" in signatories_data[name]:
+                    thumb_path = save_signature_thumbnail(name, img)
+                    if thumb_path:
+                        signatories_data[name]["thumbnail_path"] = thumb_path
+        
+        # Write the JSON file in a single write to a temporary file, then swap it in
+        # atomically so a crash mid-write can never leave a corrupted file behind
+        data = json.dumps(signatories_data, ensure_ascii=False, indent=2)
+        tmp_file = SIGNATORIES_FILE + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_file, SIGNATORIES_FILE)
         
-        # Write the JSON file
-        with open(SIGNATORIES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(signatories_data, f, ensure_ascii=False, indent=2)
+        # All changed signature images are now on disk
+        dirty.clear()
+        st.session_state.signature_thumbs = {
+            name: data["thumbnail_path"] for name, data in signatories_data.items() if "thumbnail_path" in data
+        }
             
         return True
     except Exception as e:
@@ -203,53 +430,22 @@ def get_api_key():
 # Main app
 def main():
     # Custom CSS for RTL support and styling
-    st.markdown("""
-    <style>
-    .rtl {
-        direction: rtl;
-        text-align: right;
-    }
-    .stApp {
-        font-family: 'Arial', sans-serif;
-    }
-    .result-box {
-        background-color: #f0f2f6;
-        padding: 20px;
-        border-radius: 10px;
-        margin: 10px 0;
-        direction: rtl;
-        text-align: right;
-    }
-    .status-indicator {
-        text-align: center;
-        font-size: 2em;
-        margin: 20px 0;
-    }
-    .status-icon {
-        font-size: 4em;
-        margin-bottom: 10px;
-    }
-    .green-status {
-        color: #28a745;
-    }
-    .red-status {
-        color: #dc3545;
-    }
-    .orange-status {
-        color: #fd7e14;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
     
     # Title
     st.markdown("<h1 class='rtl'>מערכת אימות חשבוניות</h1>", unsafe_allow_html=True)
     
     # Initialize session state for signatories
-    if 'signatories' not in st.session_state or 'signature_images' not in st.session_state:
+    if 'signatories' not in st.session_state or 'signature_images' not in st.session_state or 'signature_thumbs' not in st.session_state:
         # Load from file
-        signatories, signature_images = load_signatories()
+        signatories, signature_images, signature_thumbs = load_signatories()
         st.session_state.signatories = signatories
         st.session_state.signature_images = signature_images
+        st.session_state.signature_thumbs = signature_thumbs
+    
+    # Names whose signature image was uploaded and not yet saved to disk
+    if 'signature_dirty' not in st.session_state:
+        st.session_state.signature_dirty = set()
     
     # Sidebar for configuration
     with st.sidebar:
@@ -268,64 +464,77 @@ def main():
             
             name_option = st.selectbox("בחר פעולה:", options)
             
-            if name_option == "הוסף מורשה חדש":
-                new_name = st.text_input("שם מורשה החתימה:", key="new_name")
-                is_new = True
-            else:
-                new_name = name_option
-                is_new = False
-                st.info(f"עריכת מורשה קיים: {new_name}")
-            
-            # For existing signatory, show current amount as default
-            default_amount = st.session_state.signatories.get(new_name, 0) if not is_new else 0
-            new_amount = st.number_input("סכום מקסימלי לאישור (ש״ח):", 
-                                         min_value=0, 
-                                         value=default_amount,
-                                         key="new_amount")
-            
-            # Show current signature if exists
-            if not is_new and new_name in st.session_state.signature_images:
-                st.image(st.session_state.signature_images[new_name], 
-                        caption=f"חתימה נוכחית של {new_name}", 
-                        width=150)
-            
-            new_signature = st.file_uploader("העלה דוגמת חתימה (אופציונלי):", 
-                                             type=["jpg", "jpeg", "png", "webp", "heic", "heif"], 
-                                             key="new_signature")
+            # The remaining fields are inside a form, so editing them doesn't rerun
+            # the app until the form is submitted
+            # Inputs are kept after submitting, so nothing is lost if the input is rejected
+            with st.form("add_signatory", clear_on_submit=False):
+                if name_option == "הוסף מורשה חדש":
+                    new_name = st.text_input("שם מורשה החתימה:", key="new_name")
+                    is_new = True
+                else:
+                    new_name = name_option
+                    is_new = False
+                    st.info(f"עריכת מורשה קיים: {new_name}")
+                
+                # For existing signatory, show current amount as default
+                default_amount = st.session_state.signatories.get(new_name, 0) if not is_new else 0
+                new_amount = st.number_input("סכום מקסימלי לאישור (ש״ח):", 
+                                             min_value=0, 
+                                             value=default_amount,
+                                             key="new_amount")
+                
+                # Show current signature if exists
+                if not is_new and new_name in st.session_state.signature_images:
+                    st.image(get_signature_display(new_name), 
+                            caption=f"חתימה נוכחית של {new_name}", 
+                            width=150)
+                
+                new_signature = st.file_uploader("העלה דוגמת חתימה (אופציונלי):", 
+                                                 type=["jpg", "jpeg", "png", "webp", "heic", "heif"], 
+                                                 key="new_signature")
+                
+                button_label = "הוסף מורשה" if is_new else "עדכן מורשה"
+                submitted = st.form_submit_button(button_label)
             
-            button_label = "הוסף מורשה" if is_new else "עדכן מורשה"
-            if st.button(button_label):
-                if new_name and new_amount > 0:
-                    # Update amount
-                    st.session_state.signatories[new_name] = new_amount
+            if submitted:
+                if not new_name or new_amount <= 0:
+                    st.error("נא להזין שם מורשה חתימה וסכום מקסימלי גדול מ-0.")
+                else:
+                    # Open the new signature if provided (safe_open_image shows the error if it fails)
+                    signature_image = safe_open_image(new_signature) if new_signature else None
                     
-                    # Update signature if new one provided
-                    if new_signature:
-                        signature_image = safe_open_image(new_signature)
+                    # Nothing is changed or saved when the uploaded signature couldn't be opened
+                    if not new_signature or signature_image:
+                        # Update amount
+                        st.session_state.signatories[new_name] = new_amount
+                        
+                        # Update signature if new one provided
                         if signature_image:
                             st.session_state.signature_images[new_name] = signature_image
-                            
-                            # Save to file
-                            if save_signatories(st.session_state.signatories, st.session_state.signature_images):
-                                action_text = "נוסף" if is_new else "עודכן"
-                                st.success(f"מורשה החתימה {new_name} {action_text} בהצלחה!")
-                            else:
-                                st.error("שגיאה בשמירת הנתונים")
-                    else:
-                        # Save even without new signature
+                            st.session_state.signature_thumbs.pop(new_name, None)  # Rebuilt when saved
+                            st.session_state.signature_dirty.add(new_name)
+                        
+                        # Save to file. Only the changed signature image is written again (see save_signatories)
                         if save_signatories(st.session_state.signatories, st.session_state.signature_images):
                             action_text = "נוסף" if is_new else "עודכן"
                             st.success(f"מורשה החתימה {new_name} {action_text} בהצלחה!")
+                            
+                            # Force refresh to update display
+                            st.rerun()
                         else:
                             st.error("שגיאה בשמירת הנתונים")
-                            
-                    # Force refresh to update display
-                    st.rerun()
         
         # Display current signatories
         st.subheader("מורשי חתימה נוכחיים:")
         if st.session_state.signatories:
-            for name, amount in st.session_state.signatories.items():
+            # Only one page of signatories is rendered, so the number of widgets
+            # built on each rerun doesn't grow with the number of signatories
+            signatory_items = list(st.session_state.signatories.items())
+            page_count = math.ceil(len(signatory_items) / SIGNATORIES_PAGE_SIZE)
+            page = min(st.session_state.get("signatories_page", 0), page_count - 1)
+            page_start = page * SIGNATORIES_PAGE_SIZE
+            
+            for name, amount in signatory_items[page_start:page_start + SIGNATORIES_PAGE_SIZE]:
                 col1, col2, col3 = st.columns([3, 2, 1])
                 with col1:
                     st.write(f"{name}")
@@ -336,13 +545,28 @@ def main():
                         del st.session_state.signatories[name]
                         if name in st.session_state.signature_images:
                             del st.session_state.signature_images[name]
+                        st.session_state.signature_thumbs.pop(name, None)
                         
                         # Save to file
                         save_signatories(st.session_state.signatories, st.session_state.signature_images)
                         st.rerun()
                 
                 if name in st.session_state.signature_images:
-                    st.image(st.session_state.signature_images[name], caption=f"חתימה של {name}", width=150)
+                    st.image(get_signature_display(name), caption=f"חתימה של {name}", width=SIGNATURE_THUMB_SIZE)
+            
+            # Page navigation
+            if page_count > 1:
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    if st.button("הקודם", key="signatories_prev", disabled=page == 0):
+                        st.session_state.signatories_page = page - 1
+                        st.rerun()
+                with col2:
+                    st.write(f"עמוד {page + 1} מתוך {page_count}")
+                with col3:
+                    if st.button("הבא", key="signatories_next", disabled=page == page_count - 1):
+                        st.session_state.signatories_page = page + 1
+                        st.rerun()
         else:
             st.info("אין מורשי חתימה. הוסף מורשה חתימה חדש.")
     
@@ -369,6 +593,7 @@ def main():
     
     # Function to start verification
     def start_verification():
+        abandon_verification()  # Discard any unfinished earlier verification
         st.session_state.verification_in_progress = True
         st.session_state.show_verification_modal = True
         st.rerun()
@@ -380,20 +605,24 @@ def main():
         invoice_source = st.radio("בחר מקור:", ["העלאת קובץ", "צילום מהמצלמה", "חשבוניות לדוגמה"], horizontal=True)
         
         invoice_image = None
+        invoice_bytes = None  # Original file contents, lets JPEG/PNG invoices skip re-encoding
+        invoice_path = None  # Sample invoice file, opened only when verifying
         
         if invoice_source == "העלאת קובץ":
             invoice_file = st.file_uploader("העלה חשבונית:", type=["jpg", "jpeg", "png", "webp", "heic", "heif"])
             if invoice_file:
-                invoice_image = safe_open_image(invoice_file)
+                invoice_bytes = invoice_file.getvalue()
+                invoice_image = safe_open_image(io.BytesIO(invoice_bytes), max_dim=claude_api.MAX_IMAGE_DIM)
                 if invoice_image:
-                    st.image(invoice_image, caption="החשבונית שהועלתה", use_container_width=True)
+                    st.image(get_display_image(invoice_image, invoice_bytes, invoice_file.type), caption="החשבונית שהועלתה", use_container_width=True)
         
         elif invoice_source == "צילום מהמצלמה":
             camera_input = st.camera_input("צלם חשבונית")
             if camera_input:
-                invoice_image = safe_open_image(camera_input)
+                invoice_bytes = camera_input.getvalue()
+                invoice_image = safe_open_image(io.BytesIO(invoice_bytes), max_dim=claude_api.MAX_IMAGE_DIM)
                 if invoice_image:
-                    st.image(invoice_image, caption="החשבונית שצולמה", use_container_width=True)
+                    st.image(get_display_image(invoice_image, invoice_bytes, camera_input.type), caption="החשבונית שצולמה", use_container_width=True)
         
         elif invoice_source == "חשבוניות לדוגמה":
             # Get sample invoice files
@@ -402,6 +631,8 @@ def main():
             if not sample_invoices:
                 st.info("לא נמצאו חשבוניות לדוגמה בתיקיית 'invoice'. נא להוסיף קבצי חשבוניות לתיקייה.")
             else:
+                prefetch_sample_invoices(tuple(sample_invoices))
+                
                 # Extract file names for display in the selectbox
                 sample_names = [os.path.basename(f) for f in sample_invoices]
                 
@@ -411,69 +642,101 @@ def main():
                 # Get the full path of the selected sample
                 selected_path = os.path.join(SAMPLE_INVOICES_DIR, selected_sample)
                 
-                # Load the selected sample invoice
+                # Show a preview of the selected sample invoice; the full image is only
+                # decoded when it is verified
                 try:
-                    invoice_image = safe_open_image(selected_path)
-                    if invoice_image:
-                        st.image(invoice_image, caption=f"חשבונית לדוגמה: {selected_sample}", use_container_width=True)
+                    st.image(get_preview_bytes(selected_path), caption=f"חשבונית לדוגמה: {selected_sample}", use_container_width=True)
+                    invoice_path = selected_path
                 except Exception as e:
                     st.error(f"שגיאה בטעינת חשבונית לדוגמה: {str(e)}")
     
     # Verify button
-    if st.session_state.signatories and invoice_image and api_key:
+    invoice_selected = invoice_image is not None or invoice_path is not None
+    if st.session_state.signatories and invoice_selected and api_key:
         if st.button("בדוק חשבונית", type="primary", on_click=start_verification):
             pass  # The on_click handler will handle this
     elif not st.session_state.signatories:
         st.warning("נא להוסיף לפחות מורשה חתימה אחד לפני בדיקת חשבוניות.")
-    elif not invoice_image:
+    elif not invoice_selected:
         st.info("נא להעלות חשבונית לבדיקה.")
     elif not api_key:
         st.warning("נא להזין מפתח API של Anthropic.")
     
+    # Progress of the running verification, polled every 0.3 seconds as a fragment so only
+    # this part of the dialog reruns while waiting for the answer
+    @st.fragment(run_every=0.3)
+    def show_verification_progress():
+        progress_bar = st.progress(0)
+        
+        # Wait for a cancelled call of this session to finish before starting a new one
+        abandoned = st.session_state.get("abandoned_verification")
+        if abandoned is not None and not abandoned.done():
+            st.info("הבקשה הקודמת שבוטלה עדיין מסתיימת ברקע. הבדיקה תתחיל מיד כשתסתיים.")
+            return
+        st.session_state.abandoned_verification = None
+        
+        # Start the API call in the background the first time the dialog renders
+        if st.session_state.get("verification_future") is None:
+            st.session_state.verification_future = get_executor().submit(
+                verify_invoice,
+                api_key=api_key,
+                invoice_image=invoice_image,
+                invoice_bytes=invoice_bytes,
+                invoice_path=invoice_path,
+                signatories=dict(st.session_state.signatories),
+                signature_images=dict(st.session_state.signature_images)
+            )
+            st.session_state.verification_started = time.time()
+        future = st.session_state.verification_future
+        
+        if not future.done():
+            # Progress follows the elapsed time, never reaching 100% before the answer arrives
+            elapsed = time.time() - st.session_state.verification_started
+            progress_bar.progress(min(95, int(elapsed / EXPECTED_VERIFICATION_SECONDS * 100)))
+            
+            if st.button("ביטול", key="cancel_verification"):
+                # The request itself can't be interrupted; its result is simply discarded
+                abandon_verification()
+                st.session_state.verification_in_progress = False
+                st.session_state.show_verification_modal = False
+                st.rerun()
+            st.caption("ביטול סוגר את החלון בלבד; בקשה שכבר נשלחה תסתיים ברקע.")
+            return
+        
+        progress_bar.progress(100)
+        st.session_state.verification_future = None
+        try:
+            response = future.result()
+            
+            # print(f"API Response: {response}")
+            if "error" in response:
+                st.error(response["error"])
+                st.session_state.verification_result = f"<span style='color:red'>שגיאה: {response['error']}</span>"
+                st.session_state.status_code = "error"
+            else:
+                # Extract Claude's response
+                claude_response = response.get("content", [])
+                result_text = "".join(item["text"] for item in claude_response if item["type"] == "text")
+                
+                # Store both the result text and status code
+                st.session_state.verification_result = result_text
+                st.session_state.status_code = response.get("status_code", "unclear")
+        except Exception as e:
+            st.error(f"שגיאה בתהליך האימות: {str(e)}")
+            st.session_state.verification_result = f"<span style='color:red'>שגיאה: {str(e)}</span>"
+            st.session_state.status_code = "error"
+        
+        # Mark verification as complete and rerun the app to show the results
+        st.session_state.verification_in_progress = False
+        st.rerun()
+    
     # Define dialog function with decorator
     @st.dialog("תוצאות בדיקת החשבונית")
     def show_verification_results():
         if st.session_state.verification_in_progress:
             # Display progress bar
             st.markdown("<p class='rtl'>מנתח את החשבונית... אנא המתן</p>", unsafe_allow_html=True)
-            progress_bar = st.progress(0)
-            
-            # Process the verification
-            for percent_complete in range(0, 101, 10):
-                progress_bar.progress(percent_complete)
-                if percent_complete == 40:  # At 40%, start the actual API call
-                    try:
-                        response = claude_api.call_claude_api(
-                            api_key=api_key,
-                            invoice_image=invoice_image,
-                            signatories=st.session_state.signatories,
-                            signature_images=st.session_state.signature_images
-                        )
-                        
-                        # print(f"API Response: {response}")
-                        if "error" in response:
-                            st.error(response["error"])
-                            st.session_state.verification_result = f"<span style='color:red'>שגיאה: {response['error']}</span>"
-                            st.session_state.status_code = "error"
-                        else:
-                            # Extract Claude's response
-                            claude_response = response.get("content", [])
-                            result_text = ""
-                            for item in claude_response:
-                                if item["type"] == "text":
-                                    result_text += item["text"]
-                            
-                            # Store both the result text and status code
-                            st.session_state.verification_result = result_text
-                            st.session_state.status_code = response.get("status_code", "unclear")
-                    except Exception as e:
-                        st.error(f"שגיאה בתהליך האימות: {str(e)}")
-                        st.session_state.verification_result = f"<span style='color:red'>שגיאה: {str(e)}</span>"
-                        st.session_state.status_code = "error"
-            
-            # Mark verification as complete
-            st.session_state.verification_in_progress = False
-            st.rerun()
+            show_verification_progress()
         
         elif st.session_state.verification_result:
             # Get the result text
@@ -482,11 +745,13 @@ def main():
             # print(f"Result Text: {result_text[:100]}")
             
             # Check for keywords in response text - This is our main detection method
-            if "לא תקין" in result_text:
+            # (one scan collects every keyword; "לא תקין" takes priority over "לא ברור")
+            found_keywords = {match.lastgroup for match in RESULT_KEYWORDS_RE.finditer(result_text)}
+            if "invalid" in found_keywords:
                 status = "לא תקין"
                 status_color = "red"
                 status_icon = "⛔"
-            elif "לא ברור" in result_text:
+            elif "unclear" in found_keywords:
                 status = "לא ברור"
                 status_color = "orange"
                 status_icon = "❓"
@@ -499,12 +764,11 @@ def main():
             # Extract signatory name - look for names in json file
             signatory_name = "לא נמצא"
             if st.session_state.signatories:
-                for name in st.session_state.signatories.keys():
-                    if name in result_text:
-                        signatory_name = name
-                        break
+                name_match = signatory_names_pattern(tuple(st.session_state.signatories)).search(result_text)
+                if name_match:
+                    signatory_name = name_match.group(0)
             
-            if "לא ניתן לזהות" or "לא זוהתה חתימה" in result_text:
+            if "noident" in found_keywords:
                 signatory_name = "לא נמצא"
 
             # Display status indicator